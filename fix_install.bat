@@ -27,7 +27,7 @@ pip install langchain langchain-google-genai langchain-core chromadb pandas nump
 
 echo.
 echo [STEP 3/3] Installing web scraping tools...
-pip install requests beautifulsoup4 lxml schedule
+pip install requests beautifulsoup4 lxml
 
 echo.
 echo ========================================
@@ -57,7 +57,7 @@ if errorlevel 1 (
     pip install gradio google-generativeai python-dotenv certifi
     pip install langchain langchain-google-genai langchain-core
     pip install chromadb pandas numpy
-    pip install requests beautifulsoup4 lxml schedule
+    pip install requests beautifulsoup4 lxml
     pip install pytesseract opencv-python PyMuPDF pdf2image Pillow
     if errorlevel 1 (
         echo [ERROR] Some packages failed to install
@@ -0,0 +1,277 @@
+# src/_data_loader_fmt.py
+"""
+Text builders for DocumentLoader chunks.
+Kept free of closures and dynamic attributes, with typed signatures, so the
+module can be compiled ahead of time with mypyc or Cython without changes.
+"""
+
+from collections import ChainMap
+from typing import Any, Dict, Mapping, Sequence
+
+_NONE_TUPLE = ('None',)
+_EMPTY_TUPLE = ()
+
+# Chunk text layouts, filled with str.format_map. Records are looked up through
+# ChainMap(computed values, record, defaults), which matches record.get(key, default).
+_BASIC_INFO_TEMPLATE = """
+Document: {doc_name}
+Marathi Name: {document_name_marathi}
+Hindi Name: {document_name_hindi}
+Department: {issuing_department}
+Issuing Authority: {issuing_authority}
+Validity: {validity_period}
+Processing Time: {processing_time_normal}
+Tatkal Processing: {processing_time_tatkal}
+Official Portal: {official_portal}
+Helpline: {helpline_number}
+Purpose: {purpose}
+"""
+_BASIC_INFO_DEFAULTS = {
+    'document_name_marathi': 'N/A',
+    'document_name_hindi': 'N/A',
+    'issuing_department': 'N/A',
+    'issuing_authority': 'N/A',
+    'validity_period': 'N/A',
+    'processing_time_normal': 'N/A',
+    'processing_time_tatkal': 'Not available',
+    'official_portal': 'N/A',
+    'helpline_number': 'N/A',
+    'purpose': 'N/A',
+}
+
+_ELIGIBILITY_TEMPLATE = """
+Eligibility for {doc_name}:
+- Age Requirement: {age_requirement}
+- Residence Requirement: {residence_requirement}
+- Income Limit: {income_limit}
+- Other Criteria: {other_criteria}
+- Who Can Apply: {who_can_apply}
+- Exclusions: {exclusions}
+"""
+_ELIGIBILITY_DEFAULTS = {
+    'age_requirement': 'Not specified',
+    'residence_requirement': 'Not specified',
+    'income_limit': 'Not applicable',
+    'who_can_apply': 'Any eligible citizen',
+}
+
+_REQUIRED_DOC_TEMPLATE = (
+    "{number}. {doc_name_en} ({mandatory})\n"
+    "   Marathi: {doc_name_marathi}\n"
+    "   Specifications: {specifications}\n"
+    "   Alternatives: {alternatives}\n"
+    "   Copies Needed: {number_of_copies}\n\n"
+)
+_REQUIRED_DOC_DEFAULTS = {
+    'doc_name_en': 'Unknown',
+    'doc_name_marathi': 'N/A',
+    'specifications': 'N/A',
+    'number_of_copies': 1,
+}
+
+_ONLINE_HEADER_TEMPLATE = (
+    "Online Application Process for {doc_name}:\n"
+    "Portal: {portal_name}\n"
+    "URL: {portal_url}\n\n"
+    "Steps:\n"
+)
+_ONLINE_HEADER_DEFAULTS = {
+    'portal_name': 'N/A',
+    'portal_url': 'N/A',
+}
+
+_ONLINE_STEP_TEMPLATE = (
+    "\nStep {step_number}: {step_title_en}\n"
+    "Description: {step_description_en}\n"
+    "Tips: {tips}\n"
+    "Common Errors: {common_errors}\n"
+)
+_ONLINE_STEP_DEFAULTS = {
+    'step_number': None,
+    'step_title_en': None,
+    'step_description_en': None,
+    'tips': 'None',
+    'common_errors': 'None',
+}
+
+_OFFLINE_HEADER_TEMPLATE = (
+    "Offline Application Process for {doc_name}:\n"
+    "Form Number: {form_number}\n"
+    "Where to Get Form: {where_to_get_form}\n"
+    "Submission Office: {submission_office}\n\n"
+    "Steps:\n"
+)
+_OFFLINE_HEADER_DEFAULTS = {
+    'form_number': 'N/A',
+    'where_to_get_form': 'N/A',
+    'submission_office': 'N/A',
+}
+
+_OFFLINE_STEP_TEMPLATE = (
+    "\nStep {step_number}: {step_title_en}\n"
+    "Description: {step_description_en}\n"
+)
+_OFFLINE_STEP_DEFAULTS = {
+    'step_number': None,
+    'step_title_en': None,
+    'step_description_en': None,
+}
+
+_FEE_TEMPLATE = (
+    "Category: {category}\n"
+    "Amount: ₹{fee_amount}\n"
+    "Payment Modes: {payment_modes}\n"
+    "Exemptions: {exemptions}\n\n"
+)
+_FEE_DEFAULTS = {
+    'category': 'N/A',
+    'fee_amount': 0,
+    'exemptions': 'None',
+}
+
+_DISTRICT_TEMPLATE = """
+District-Specific Information for {doc_name} in {district_name}:
+Variations: {variations}
+Special Requirements: {special_requirements}
+Different Fees: {different_fees}
+Different Offices: {different_offices}
+Notes: {notes}
+"""
+_DISTRICT_DEFAULTS = {
+    'district_name': None,
+    'variations': 'Same as general procedure',
+    'different_fees': 'Same as general fees',
+    'different_offices': 'Standard offices',
+    'notes': 'N/A',
+}
+
+_OFFICE_TEMPLATE = """
+Office for {doc_name}:
+District: {district}
+Taluka: {taluka}
+Office Type: {office_type}
+Name: {office_name}
+Address: {address}
+Pincode: {pincode}
+Contact: {contact_number}
+Email: {email}
+Working Hours: {working_hours}
+Weekly Off: {weekly_off}
+Best Time to Visit: {best_time_to_visit}
+"""
+_OFFICE_DEFAULTS = dict.fromkeys((
+    'district', 'taluka', 'office_type', 'office_name', 'address', 'pincode',
+    'contact_number', 'email', 'working_hours', 'weekly_off', 'best_time_to_visit'
+), 'N/A')
+
+_FAQ_TEMPLATE = """
+FAQ for {doc_name}:
+Q: {question_en}
+Q (Marathi): {question_marathi}
+
+A: {answer_en}
+A (Marathi): {answer_marathi}
+
+Category: {category}
+"""
+_FAQ_DEFAULTS = {
+    'question_en': 'N/A',
+    'question_marathi': 'N/A',
+    'answer_en': 'N/A',
+    'answer_marathi': 'N/A',
+    'category': 'General',
+}
+
+_ISSUE_TEMPLATE = """
+Common Issue with {doc_name}:
+Problem: {issue_description_en}
+Problem (Marathi): {issue_description_marathi}
+
+Solution: {solution_en}
+Solution (Marathi): {solution_marathi}
+
+Frequency: {frequency}
+Prevention: {prevention_tips}
+"""
+_ISSUE_DEFAULTS = {
+    'issue_description_en': 'N/A',
+    'issue_description_marathi': 'N/A',
+    'solution_en': 'N/A',
+    'solution_marathi': 'N/A',
+    'frequency': 'Unknown',
+    'prevention_tips': 'N/A',
+}
+
+def _fill(template: str, defaults: Dict[str, Any], record: Mapping[str, Any], **computed: Any) -> str:
+    """Render a chunk template for one record"""
+    return template.format_map(ChainMap(computed, record, defaults))
+
+
+def fmt_basic(doc_name: str, doc_info: Mapping[str, Any]) -> str:
+    """Basic information chunk"""
+    return _fill(_BASIC_INFO_TEMPLATE, _BASIC_INFO_DEFAULTS, doc_info, doc_name=doc_name)
+
+def fmt_eligibility(doc_name: str, eligibility: Mapping[str, Any]) -> str:
+    """Eligibility criteria chunk"""
+    return _fill(
+        _ELIGIBILITY_TEMPLATE, _ELIGIBILITY_DEFAULTS, eligibility,
+        doc_name=doc_name,
+        other_criteria=', '.join(eligibility.get('other_criteria', _NONE_TUPLE)),
+        exclusions=', '.join(eligibility.get('exclusions', _NONE_TUPLE))
+    )
+
+def fmt_required_documents(doc_name: str, required_docs: Sequence[Mapping[str, Any]]) -> str:
+    """Required documents chunk"""
+    parts = [f"Required Documents for {doc_name}:\n\n"]
+    for i, req_doc in enumerate(required_docs, 1):
+        parts.append(_fill(
+            _REQUIRED_DOC_TEMPLATE, _REQUIRED_DOC_DEFAULTS, req_doc,
+            number=i,
+            mandatory="✓ Mandatory" if req_doc.get('is_mandatory') else "○ Optional",
+            alternatives=', '.join(req_doc.get('alternatives', _NONE_TUPLE))
+        ))
+    return "".join(parts)
+
+def fmt_online_process(doc_name: str, online_process: Mapping[str, Any]) -> str:
+    """Online application process chunk"""
+    parts = [_fill(_ONLINE_HEADER_TEMPLATE, _ONLINE_HEADER_DEFAULTS, online_process, doc_name=doc_name)]
+    for step in online_process.get('steps', _EMPTY_TUPLE):
+        parts.append(_fill(_ONLINE_STEP_TEMPLATE, _ONLINE_STEP_DEFAULTS, step))
+    return "".join(parts)
+
+def fmt_offline_process(doc_name: str, offline_process: Mapping[str, Any]) -> str:
+    """Offline application process chunk"""
+    parts = [_fill(_OFFLINE_HEADER_TEMPLATE, _OFFLINE_HEADER_DEFAULTS, offline_process, doc_name=doc_name)]
+    for step in offline_process.get('steps', _EMPTY_TUPLE):
+        parts.append(_fill(_OFFLINE_STEP_TEMPLATE, _OFFLINE_STEP_DEFAULTS, step))
+    return "".join(parts)
+
+def fmt_fees(doc_name: str, fees: Sequence[Mapping[str, Any]]) -> str:
+    """Fee structure chunk"""
+    parts = [f"Fees for {doc_name}:\n\n"]
+    for fee in fees:
+        parts.append(_fill(
+            _FEE_TEMPLATE, _FEE_DEFAULTS, fee,
+            payment_modes=', '.join(fee.get('payment_modes', _EMPTY_TUPLE))
+        ))
+    return "".join(parts)
+
+def fmt_district(doc_name: str, district: Mapping[str, Any]) -> str:
+    """District variation chunk"""
+    return _fill(
+        _DISTRICT_TEMPLATE, _DISTRICT_DEFAULTS, district,
+        doc_name=doc_name,
+        special_requirements=', '.join(district.get('special_requirements', _NONE_TUPLE))
+    )
+
+def fmt_office(doc_name: str, office: Mapping[str, Any]) -> str:
+    """Office details chunk"""
+    return _fill(_OFFICE_TEMPLATE, _OFFICE_DEFAULTS, office, doc_name=doc_name)
+
+def fmt_faq(doc_name: str, faq: Mapping[str, Any]) -> str:
+    """FAQ chunk"""
+    return _fill(_FAQ_TEMPLATE, _FAQ_DEFAULTS, faq, doc_name=doc_name)
+
+def fmt_issue(doc_name: str, issue: Mapping[str, Any]) -> str:
+    """Common issue chunk"""
+    return _fill(_ISSUE_TEMPLATE, _ISSUE_DEFAULTS, issue, doc_name=doc_name)
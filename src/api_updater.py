@@ -5,15 +5,31 @@ Uses official APIs and RSS feeds where available
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+import glob
+import io
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional
-import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.json_utils import read_json, write_json
+
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Markdown layout for updates shown in chatbot responses
+_UPDATES_HEADER = "\n\n🔔 **RECENT GOVERNMENT UPDATES:**\n"
+_UPDATES_FOOTER = "\n⚠️ **Note:** Please verify latest information on official government portals.\n"
+_UPDATE_TEMPLATE = "\n**Update {n}:**\n• {title}\n{details}{date}{link}• Source: {source}\n"
+
 class APIUpdater:
     def __init__(self):
         # Disable SSL warnings
@@ -42,15 +58,32 @@ class APIUpdater:
         # Cache directory
         self.cache_dir = "cache/api_updates"
         os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Formatted updates per certificate type as (cache file mtime, text), preloaded from the cache files
+        self._preloaded: Dict[str, Tuple[int, str]] = {}
+        for cache_file in glob.glob(os.path.join(self.cache_dir, '*_updates.json')):
+            self.invalidate(os.path.basename(cache_file)[:-len('_updates.json')])
+        
+        # Shared session so repeated requests to the same host reuse connections
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def fetch_with_fallback(self, url: str) -> Optional[str]:
         """Fetch content with multiple fallback methods"""
         methods = [
-            # Method 1: Standard requests with SSL disabled
-            lambda: requests.get(url, verify=False, timeout=10).text,
+            # Method 1: Standard request. verify=False is passed per call because a CURL_CA_BUNDLE
+            # in the environment (set by the apps) would override session.verify
+            lambda: self.session.get(url, verify=False, timeout=10).text,
             
             # Method 2: Using different user agent
-            lambda: requests.get(
+            lambda: self.session.get(
                 url, 
                 verify=False, 
                 timeout=10,
@@ -58,7 +91,7 @@ class APIUpdater:
             ).text,
             
             # Method 3: Using curl-like headers
-            lambda: requests.get(
+            lambda: self.session.get(
                 url,
                 verify=False,
                 timeout=10,
@@ -84,28 +117,66 @@ class APIUpdater:
     def parse_rss_feed(self, rss_content: str) -> List[Dict]:
         """Parse RSS feed content"""
         try:
-            root = ET.fromstring(rss_content)
-            items = []
-            
-            for item in root.findall('.//item'):
-                title = item.find('title')
-                description = item.find('description')
-                link = item.find('link')
-                pub_date = item.find('pubDate')
-                
-                items.append({
-                    'title': title.text if title is not None else '',
-                    'description': description.text if description is not None else '',
-                    'link': link.text if link is not None else '',
-                    'date': pub_date.text if pub_date is not None else '',
-                    'extracted_at': datetime.now().isoformat()
-                })
+            if isinstance(rss_content, str):
+                rss_content = rss_content.encode('utf-8')
             
-            return items
+            return list(self._iter_rss_items(io.BytesIO(rss_content)))
         except Exception as e:
             logger.error(f"Error parsing RSS feed: {e}")
             return []
     
+    def _iter_rss_items(self, source) -> Iterator[Dict]:
+        """Incrementally parse an RSS document from a binary file-like object.
+        
+        Only <item> elements are materialized and each one is cleared after
+        extraction, so memory stays bounded by the current item.
+        """
+        extracted_at = datetime.now().isoformat()
+        
+        if LXML_AVAILABLE:
+            events = ET.iterparse(source, events=('end',), tag='item', resolve_entities=False)
+        else:
+            events = (
+                (event, elem) for event, elem in ET.iterparse(source, events=('end',))
+                if elem.tag == 'item'
+            )
+        
+        for _, item in events:
+            title = item.find('title')
+            description = item.find('description')
+            link = item.find('link')
+            pub_date = item.find('pubDate')
+            
+            yield {
+                'title': title.text if title is not None else '',
+                'description': description.text if description is not None else '',
+                'link': link.text if link is not None else '',
+                'date': pub_date.text if pub_date is not None else '',
+                'extracted_at': extracted_at
+            }
+            item.clear()
+    
+    def _fetch_and_parse_rss(self, url: str) -> Iterator[Dict]:
+        """Stream an RSS feed and yield items while the body is still downloading"""
+        try:
+            response = self.session.get(url, verify=False, timeout=10, stream=True)
+        except Exception as e:
+            logger.warning(f"Streaming failed for {url}: {e}")
+            
+            # Fall back to buffered fetch with alternate headers
+            content = self.fetch_with_fallback(url)
+            if content:
+                yield from self.parse_rss_feed(content)
+            return
+        
+        with response:
+            logger.info(f"✓ Streaming {url}")
+            response.raw.decode_content = True
+            try:
+                yield from self._iter_rss_items(response.raw)
+            except Exception as e:
+                logger.error(f"Error parsing RSS feed {url}: {e}")
+    
     def check_government_apis(self) -> Dict[str, List[Dict]]:
         """Check government APIs and RSS feeds for updates"""
         all_updates = {}
@@ -117,15 +188,12 @@ class APIUpdater:
             if 'rss_feeds' in config:
                 for rss_path in config['rss_feeds']:
                     rss_url = config['base_url'] + rss_path
-                    content = self.fetch_with_fallback(rss_url)
+                    source_key = f"{source_name}_rss"
                     
-                    if content:
-                        items = self.parse_rss_feed(content)
-                        if items:
-                            source_key = f"{source_name}_rss"
-                            if source_key not in all_updates:
-                                all_updates[source_key] = []
-                            all_updates[source_key].extend(items)
+                    for item in self._fetch_and_parse_rss(rss_url):
+                        if source_key not in all_updates:
+                            all_updates[source_key] = []
+                        all_updates[source_key].append(item)
             
             # Try API endpoints
             if 'api_endpoints' in config:
@@ -151,6 +219,8 @@ class APIUpdater:
     
     def create_mock_updates(self) -> Dict[str, List[Dict]]:
         """Create mock updates for demonstration"""
+        extracted_at = datetime.now().isoformat()
+        
         mock_updates = {
             'income_certificate': [{
                 'title': 'Income Certificate Fee Revision',
@@ -158,7 +228,7 @@ class APIUpdater:
                 'date': '2025-01-20',
                 'source': 'Maharashtra Revenue Department',
                 'link': 'https://revenue.maharashtra.gov.in/notifications/income-cert-fee-2025',
-                'extracted_at': datetime.now().isoformat()
+                'extracted_at': extracted_at
             }],
             'caste_certificate': [{
                 'title': 'Caste Validity Committee Schedule',
@@ -166,7 +236,7 @@ class APIUpdater:
                 'date': '2025-01-18',
                 'source': 'Social Justice Department',
                 'link': 'https://sjsa.maharashtra.gov.in/cvc-schedule-2025',
-                'extracted_at': datetime.now().isoformat()
+                'extracted_at': extracted_at
             }],
             'ncl_certificate': [{
                 'title': 'NCL Income Limit Update',
@@ -174,15 +244,15 @@ class APIUpdater:
                 'date': '2025-01-15',
                 'source': 'Social Justice Department',
                 'link': 'https://sjsa.maharashtra.gov.in/ncl-income-limit-2025',
-                'extracted_at': datetime.now().isoformat()
+                'extracted_at': extracted_at
             }]
         }
         
         # Save mock updates
         for cert_type, updates in mock_updates.items():
             cache_file = os.path.join(self.cache_dir, f"{cert_type}_updates.json")
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(updates, f, indent=2, ensure_ascii=False)
+            write_json(cache_file, updates)
+            self.invalidate(cert_type)
         
         logger.info("✓ Mock updates created successfully")
         return mock_updates
@@ -191,40 +261,66 @@ class APIUpdater:
         """Get formatted updates for a certificate type"""
         cache_file = os.path.join(self.cache_dir, f"{certificate_type}_updates.json")
         
-        if not os.path.exists(cache_file):
+        try:
+            mtime = os.stat(cache_file).st_mtime_ns
+        except OSError:
+            self._preloaded.pop(certificate_type, None)
             return ""
         
+        # Reload when another process (or a refresh) has rewritten the cache file
+        preloaded = self._preloaded.get(certificate_type)
+        if preloaded is None or preloaded[0] != mtime:
+            self.invalidate(certificate_type)
+            preloaded = self._preloaded.get(certificate_type)
+        
+        return preloaded[1] if preloaded else ""
+    
+    def invalidate(self, certificate_type: str):
+        """Reload formatted updates for a certificate type after its cache file changes"""
+        cache_file = os.path.join(self.cache_dir, f"{certificate_type}_updates.json")
+        
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                updates = json.load(f)
-            
-            if not updates:
-                return ""
-            
-            formatted_updates = "\n\n🔔 **RECENT GOVERNMENT UPDATES:**\n"
-            
-            for i, update in enumerate(updates[-2:], 1):  # Show last 2 updates
-                formatted_updates += f"\n**Update {i}:**\n"
-                formatted_updates += f"• {update.get('title', update.get('description', 'Government Update'))}\n"
-                
-                if update.get('description') and update.get('title'):
-                    formatted_updates += f"• Details: {update['description'][:150]}{'...' if len(update['description']) > 150 else ''}\n"
-                
-                if update.get('date'):
-                    formatted_updates += f"• Date: {update['date']}\n"
-                
-                if update.get('link'):
-                    formatted_updates += f"• Link: {update['link']}\n"
-                
-                formatted_updates += f"• Source: {update.get('source', 'Government Website')}\n"
-            
-            formatted_updates += "\n⚠️ **Note:** Please verify latest information on official government portals.\n"
-            
-            return formatted_updates
-            
+            mtime = os.stat(cache_file).st_mtime_ns
+        except OSError:
+            self._preloaded.pop(certificate_type, None)
+            return
+        
+        try:
+            updates = read_json(cache_file)
+            self._preloaded[certificate_type] = (mtime, self._format_updates(updates))
         except Exception as e:
             logger.error(f"Error reading updates for {certificate_type}: {e}")
+            self._preloaded.pop(certificate_type, None)
+    
+    def _format_updates(self, updates: List[Dict]) -> str:
+        """Render updates as Markdown for the chatbot prompt"""
+        if not updates:
             return ""
+        
+        parts = [_UPDATES_HEADER]
+        
+        for i, update in enumerate(updates[-2:], 1):  # Show last 2 updates
+            title = update.get('title')
+            description = update.get('description')
+            date = update.get('date')
+            link = update.get('link')
+            
+            details = ""
+            if description and title:
+                details = f"• Details: {description[:150]}{'...' if len(description) > 150 else ''}\n"
+            
+            parts.append(_UPDATE_TEMPLATE.format_map({
+                'n': i,
+                'title': update.get('title', update.get('description', 'Government Update')),
+                'details': details,
+                'date': f"• Date: {date}\n" if date else "",
+                'link': f"• Link: {link}\n" if link else "",
+                'source': update.get('source', 'Government Website'),
+            }))
+        
+        parts.append(_UPDATES_FOOTER)
+        
+        return "".join(parts)
 
 # Singleton instance
 api_updater = APIUpdater()
@@ -1,182 +1,323 @@
 # src/chatbot.py
 import google.generativeai as genai
+from google.generativeai import caching
 from typing import List, Dict, Optional
+from collections import defaultdict, deque
+from datetime import timedelta
+from functools import lru_cache
+from itertools import islice
+import hashlib
+import re
 import time
 from src.config import Config
 from src.data_loader import DocumentLoader
 
+# Language detection lookups, built once at import time
+_WORD_RE = re.compile(r'[\w\u0900-\u097F]+')
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+_ALPHA_RE = re.compile(r'[^\W\d_]')
+
+_MARATHI_INDICATORS = frozenset(['आहे', 'असते', 'करावे', 'मिळते', 'येते', 'होते', 'आणि', 'किंवा', 'तर', 'पण'])
+_HINDI_INDICATORS = frozenset(['है', 'होता', 'करना', 'मिलता', 'आता', 'और', 'या', 'तो', 'लेकिन'])
+
+# Keyword matchers: one compiled alternation per group scans the message once
+def _keyword_pattern(keywords) -> re.Pattern:
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+_CERTIFICATE_PATTERNS = {
+    'income_certificate': _keyword_pattern(['income', 'उत्पन्न', 'salary', 'earnings']),
+    'caste_certificate': _keyword_pattern(['caste', 'जात', 'obc', 'sc', 'st', 'vjnt', 'sbc']),
+    'domicile_certificate': _keyword_pattern(['domicile', 'अधिवास', 'residence', 'निवास']),
+    'birth_certificate': _keyword_pattern(['birth', 'जन्म', 'born']),
+    'non_creamy_certificate': _keyword_pattern(['ncl', 'non creamy', 'गैर क्रीमी', 'creamy layer']),
+}
+
+# Explicit language requests match anywhere in the text, so inflected forms
+# such as "मराठीमध्ये" or "मराठीतून" still count
+_MARATHI_HINT_RE = _keyword_pattern(['marathi', 'मराठी'])
+_HINDI_HINT_RE = _keyword_pattern(['hindi', 'हिंदी'])
+_ENGLISH_HINT_RE = _keyword_pattern(['english', 'इंग्रजी'])
+
+_KB_KEYWORD_RE = _keyword_pattern([
+    'certificate', 'प्रमाणपत्र', 'दाखला', 'income', 'उत्पन्न', 'caste', 'जात',
+    'domicile', 'अधिवास', 'birth', 'जन्म', 'ncl', 'non creamy', 'गैर क्रीमी',
+    'tahsildar', 'तहसीलदार', 'revenue', 'महसूल', 'application', 'अर्ज',
+    'documents', 'कागदपत्रे', 'fee', 'शुल्क', 'office', 'कार्यालय'
+])
+
+# Gemini context caches are named with this prefix plus a digest of the model and knowledge base
+_CONTEXT_CACHE_PREFIX = 'govguidebot-knowledge-base-'
+
+# Static prompt fragments
+_KB_SEPARATOR = "\n" + "=" * 80 + "\n\n"
+
+_LANG_INSTRUCTIONS = {
+    'en': "\n\nCRITICAL LANGUAGE INSTRUCTION: The user is communicating in ENGLISH. You MUST respond ONLY in ENGLISH. Do NOT use Hindi, Marathi, or Devanagari script in your response. Use only English language and Roman script.",
+    'hi': "\n\nCRITICAL LANGUAGE INSTRUCTION: The user is communicating in HINDI. You MUST respond ONLY in HINDI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms.",
+    'mr': "\n\nCRITICAL LANGUAGE INSTRUCTION: The user is communicating in MARATHI. You MUST respond ONLY in MARATHI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms.",
+}
+
+_FALLBACK_LANG_INSTRUCTIONS = {
+    'en': "\n\nCRITICAL LANGUAGE INSTRUCTION: You MUST respond ONLY in ENGLISH. Do NOT use Hindi, Marathi, or Devanagari script in your response.",
+    'hi': "\n\nCRITICAL LANGUAGE INSTRUCTION: You MUST respond ONLY in HINDI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms.",
+    'mr': "\n\nCRITICAL LANGUAGE INSTRUCTION: You MUST respond ONLY in MARATHI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms.",
+}
+
+_DISCLAIMERS = {
+    'en': "\n\n💡 **Note:** This information is from my general knowledge. For official procedures and latest updates, please verify on government portals or contact relevant offices directly.",
+    'hi': "\n\n💡 **नोट:** यह जानकारी मेरे सामान्य ज्ञान से है। आधिकारिक प्रक्रियाओं और नवीनतम अपडेट के लिए, कृपया सरकारी पोर्टल पर सत्यापित करें या संबंधित कार्यालयों से सीधे संपर्क करें।",
+    'mr': "\n\n💡 **टीप:** ही माहिती माझ्या सामान्य ज्ञानातून आहे. अधिकृत प्रक्रिया आणि नवीनतम अपडेटसाठी, कृपया सरकारी पोर्टलवर सत्यापित करा किंवा संबंधित कार्यालयांशी थेट संपर्क साधा.",
+}
+
+_PROMPT_SUFFIX = """
+
+INSTRUCTIONS FOR RESPONSE:
+1. Search the knowledge base in your system instructions for relevant information
+2. Provide specific, accurate answers with details
+3. Include office addresses, phone numbers, fees, and steps when applicable
+4. If the user's district is mentioned, prioritize information for that district
+5. If recent government updates are available, mention them at the end of your response
+6. If information is missing, clearly state "I don't have this specific information in my database"
+7. Be conversational and helpful
+8. STRICTLY follow the language instruction above - do NOT deviate from the specified language
+9. Maintain complete language consistency throughout your entire response
+
+RESPOND NOW:"""
+
+@lru_cache(maxsize=2048)
+def _detect_language_cached(text: str) -> str:
+    """Detect language of user input"""
+    # Check for explicit language mentions
+    if _MARATHI_HINT_RE.search(text):
+        return 'mr'
+    if _HINDI_HINT_RE.search(text):
+        return 'hi'
+    if _ENGLISH_HINT_RE.search(text):
+        return 'en'
+        
+    # Check for Devanagari script (Hindi/Marathi)
+    devanagari_chars = len(_DEVANAGARI_RE.findall(text))
+    total_chars = len(_ALPHA_RE.findall(text))
+    
+    if total_chars > 0 and devanagari_chars / total_chars > 0.3:
+        # More sophisticated detection for Hindi vs Marathi, counting whole indicator words
+        words = frozenset(_WORD_RE.findall(text.lower()))
+        marathi_count = len(words & _MARATHI_INDICATORS)
+        hindi_count = len(words & _HINDI_INDICATORS)
+        
+        if marathi_count > hindi_count:
+            return 'mr'
+        else:
+            return 'hi'
+    
+    return 'en'
+
 class GovGuideBot:
     def __init__(self, data_dir: str):
         # Configure Gemini
         genai.configure(api_key=Config.GOOGLE_API_KEY)
         
-        # Initialize model
-        self.model = genai.GenerativeModel(
-            model_name=Config.MODEL_NAME,
-            generation_config={
-                'temperature': Config.TEMPERATURE,
-                'max_output_tokens': Config.MAX_OUTPUT_TOKENS,
-            }
-        )
-        
         # Load documents
         self.loader = DocumentLoader(data_dir)
         self.documents = self.loader.load_all_documents()
         self.text_chunks = self.loader.prepare_text_chunks()
         
+        # Search index over lower-cased chunk texts
+        self._build_search_index()
+        
+        # Relevance only depends on the message and the static knowledge base
+        self._relevance_cache = lru_cache(maxsize=1024)(self._match_knowledge_base)
+        
         # Build knowledge base string
         self.knowledge_base = self._build_knowledge_base()
         
-        # Conversation history
-        self.conversation_history = []
+        # Initialize models. The static system prompt and knowledge base are sent
+        # once as the system instruction instead of in every prompt; general
+        # queries use a separate model without the knowledge base.
+        self._generation_config = {
+            'temperature': Config.TEMPERATURE,
+            'max_output_tokens': Config.MAX_OUTPUT_TOKENS,
+        }
+        self._system_instruction = f"{Config.SYSTEM_PROMPT}\n\n{self.knowledge_base}"
+        self._context_cache = None
+        self._context_cache_expires = 0.0
+        digest = hashlib.blake2b(f"{Config.MODEL_NAME}\n{self._system_instruction}".encode(), digest_size=8).hexdigest()
+        self._context_cache_name = _CONTEXT_CACHE_PREFIX + digest
+        self.model = self._create_knowledge_model()
+        self.fallback_model = genai.GenerativeModel(
+            model_name=Config.MODEL_NAME,
+            generation_config=self._generation_config
+        )
+        
+        # Conversation history, plus each exchange pre-rendered for prompt context
+        self.conversation_history = deque(maxlen=10)
+        self._rendered_history = deque(maxlen=10)
         
         # Rate limiting
-        self.request_times = []
+        self.request_times = deque(maxlen=Config.REQUESTS_PER_MINUTE)
+        
+        # Update sources are optional; resolve them once instead of per chat turn
+        try:
+            from src.web_scraper import web_scraper
+            self._web_scraper = web_scraper
+        except Exception as e:
+            print(f"⚠️ Web scraper updates unavailable: {e}")
+            self._web_scraper = None
+        
+        try:
+            from src.api_updater import api_updater
+            self._api_updater = api_updater
+        except Exception as e:
+            print(f"⚠️ API updates unavailable: {e}")
+            self._api_updater = None
         
         print(f"✓ GovGuideBot initialized with {len(self.documents)} documents")
         print(f"✓ Created {len(self.text_chunks)} knowledge chunks")
     
+    def _create_knowledge_model(self) -> genai.GenerativeModel:
+        """Create the knowledge base model, using Gemini context caching when enabled"""
+        if Config.USE_CONTEXT_CACHE:
+            try:
+                self._context_cache = self._reuse_context_cache() or caching.CachedContent.create(
+                    model=Config.MODEL_NAME,
+                    display_name=self._context_cache_name,
+                    system_instruction=self._system_instruction,
+                    ttl=timedelta(seconds=Config.CONTEXT_CACHE_TTL)
+                )
+                self._context_cache_expires = time.time() + Config.CONTEXT_CACHE_TTL
+                print("✓ Knowledge base stored in Gemini context cache")
+                
+                return genai.GenerativeModel.from_cached_content(
+                    cached_content=self._context_cache,
+                    generation_config=self._generation_config
+                )
+            except Exception as e:
+                print(f"⚠️ Context caching unavailable, sending knowledge base as system instruction: {e}")
+                self._context_cache = None
+        
+        return genai.GenerativeModel(
+            model_name=Config.MODEL_NAME,
+            system_instruction=self._system_instruction,
+            generation_config=self._generation_config
+        )
+    
+    def _reuse_context_cache(self) -> Optional[caching.CachedContent]:
+        """Reuse the cache left by an earlier run for this knowledge base, deleting outdated ones"""
+        reused = None
+        for cache in caching.CachedContent.list():
+            if not cache.display_name.startswith(_CONTEXT_CACHE_PREFIX):
+                continue
+            
+            if reused is None and cache.display_name == self._context_cache_name:
+                cache.update(ttl=timedelta(seconds=Config.CONTEXT_CACHE_TTL))
+                reused = cache
+            else:
+                # Built from an older knowledge base (or a duplicate); stop paying for it now
+                cache.delete()
+        
+        return reused
+    
+    def _refresh_context_cache(self):
+        """Extend the context cache TTL before it expires, or rebuild the model if that fails"""
+        if self._context_cache is None or time.time() < self._context_cache_expires - 300:
+            return
+        
+        try:
+            self._context_cache.update(ttl=timedelta(seconds=Config.CONTEXT_CACHE_TTL))
+            self._context_cache_expires = time.time() + Config.CONTEXT_CACHE_TTL
+        except Exception as e:
+            print(f"⚠️ Could not extend context cache: {e}")
+            self.model = self._create_knowledge_model()
+    
     def _build_knowledge_base(self) -> str:
         """Build a comprehensive knowledge base string"""
-        kb = "KNOWLEDGE BASE:\n\n"
-        
-        for chunk in self.text_chunks:
-            kb += f"{chunk['text']}\n{'='*80}\n\n"
+        return "KNOWLEDGE BASE:\n\n" + "".join(
+            chunk['text'] + _KB_SEPARATOR for chunk in self.text_chunks
+        )
+    
+    def _build_search_index(self):
+        """Cache lower-cased chunk texts and build an inverted token -> chunk index"""
+        self._chunk_texts_lower = [chunk['text'].lower() for chunk in self.text_chunks]
         
-        return kb
+        token_index = defaultdict(set)
+        for idx, text_lower in enumerate(self._chunk_texts_lower):
+            for token in _WORD_RE.findall(text_lower):
+                token_index[token].add(idx)
+        self._token_index = dict(token_index)
     
     def _check_rate_limit(self):
         """Check if we're within rate limits (15 RPM for free tier)"""
         current_time = time.time()
         
         # Remove requests older than 1 minute
-        self.request_times = [t for t in self.request_times if current_time - t < 60]
+        while self.request_times and current_time - self.request_times[0] >= 60:
+            self.request_times.popleft()
         
         if len(self.request_times) >= Config.REQUESTS_PER_MINUTE:
             wait_time = 60 - (current_time - self.request_times[0])
             if wait_time > 0:
                 print(f"⏳ Rate limit reached. Waiting {wait_time:.1f} seconds...")
                 time.sleep(wait_time)
-                self.request_times = []
+                self.request_times.clear()
         
         self.request_times.append(current_time)
     
     def _detect_language(self, text: str) -> str:
         """Detect language of user input"""
-        text_lower = text.lower()
-        
-        # Check for explicit language mentions
-        if any(word in text_lower for word in ['marathi', 'मराठी', 'मराठीत', 'in marathi']):
-            return 'mr'
-        if any(word in text_lower for word in ['hindi', 'हिंदी', 'हिंदीत', 'in hindi']):
-            return 'hi'
-        if any(word in text_lower for word in ['english', 'in english', 'इंग्रजी', 'इंग्रजीत']):
-            return 'en'
-            
-        # Check for Devanagari script (Hindi/Marathi)
-        devanagari_chars = sum(1 for char in text if '\u0900' <= char <= '\u097F')
-        total_chars = len([char for char in text if char.isalpha()])
-        
-        if total_chars > 0 and devanagari_chars / total_chars > 0.3:
-            # More sophisticated detection for Hindi vs Marathi
-            marathi_indicators = ['आहे', 'असते', 'करावे', 'मिळते', 'येते', 'होते', 'आणि', 'किंवा', 'तर', 'पण']
-            hindi_indicators = ['है', 'होता', 'करना', 'मिलता', 'आता', 'होता', 'और', 'या', 'तो', 'लेकिन']
-            
-            marathi_count = sum(1 for word in marathi_indicators if word in text)
-            hindi_count = sum(1 for word in hindi_indicators if word in text)
-            
-            if marathi_count > hindi_count:
-                return 'mr'
-            else:
-                return 'hi'
-        
-        return 'en'
+        return _detect_language_cached(text)
     
     def _create_prompt(self, user_message: str, language: str) -> str:
         """Create the full prompt for Gemini"""
         
         # Add language-specific instructions
-        lang_instruction = ""
-        if language == 'en':
-            lang_instruction = "\n\nCRITICAL LANGUAGE INSTRUCTION: The user is communicating in ENGLISH. You MUST respond ONLY in ENGLISH. Do NOT use Hindi, Marathi, or Devanagari script in your response. Use only English language and Roman script."
-        elif language == 'hi':
-            lang_instruction = "\n\nCRITICAL LANGUAGE INSTRUCTION: The user is communicating in HINDI. You MUST respond ONLY in HINDI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms."
-        elif language == 'mr':
-            lang_instruction = "\n\nCRITICAL LANGUAGE INSTRUCTION: The user is communicating in MARATHI. You MUST respond ONLY in MARATHI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms."
+        lang_instruction = _LANG_INSTRUCTIONS.get(language, "")
         
         # Build conversation context
-        context = ""
-        if self.conversation_history:
-            context = "\n\nPREVIOUS CONVERSATION:\n"
-            for msg in self.conversation_history[-6:]:  # Last 3 exchanges
-                context += f"User: {msg['user']}\nAssistant: {msg['assistant']}\n\n"
+        context = self._history_context(6)  # Last 3 exchanges
         
         # Get recent government updates
         recent_updates = self._get_relevant_updates(user_message)
         
         # Full prompt
-        prompt = f"""{Config.SYSTEM_PROMPT}{lang_instruction}
-
-{self.knowledge_base}
-
-{recent_updates}
-
-{context}
-
-CURRENT USER QUERY:
-{user_message}
-
-INSTRUCTIONS FOR RESPONSE:
-1. Search the knowledge base above for relevant information
-2. Provide specific, accurate answers with details
-3. Include office addresses, phone numbers, fees, and steps when applicable
-4. If the user's district is mentioned, prioritize information for that district
-5. If recent government updates are available, mention them at the end of your response
-6. If information is missing, clearly state "I don't have this specific information in my database"
-7. Be conversational and helpful
-8. STRICTLY follow the language instruction above - do NOT deviate from the specified language
-9. Maintain complete language consistency throughout your entire response
-
-RESPOND NOW:"""
+        prompt = f"{lang_instruction}{recent_updates}{context}\n\nCURRENT USER QUERY:\n{user_message}{_PROMPT_SUFFIX}"
         
-        return prompt
+        return prompt.lstrip()
+    
+    def _history_context(self, max_messages: int) -> str:
+        """Join the most recent pre-rendered exchanges into a prompt section"""
+        if not self._rendered_history:
+            return ""
+        
+        start = max(0, len(self._rendered_history) - max_messages)
+        return "\n\nPREVIOUS CONVERSATION:\n" + "".join(islice(self._rendered_history, start, None))
     
     def _get_relevant_updates(self, user_message: str) -> str:
         """Get relevant government updates based on user query"""
         try:
             # Determine which certificate type the user is asking about
-            message_lower = user_message.lower()
-            certificate_type = None
-            
-            if any(word in message_lower for word in ['income', 'उत्पन्न', 'salary', 'earnings']):
-                certificate_type = 'income_certificate'
-            elif any(word in message_lower for word in ['caste', 'जात', 'obc', 'sc', 'st', 'vjnt', 'sbc']):
-                certificate_type = 'caste_certificate'
-            elif any(word in message_lower for word in ['domicile', 'अधिवास', 'residence', 'निवास']):
-                certificate_type = 'domicile_certificate'
-            elif any(word in message_lower for word in ['birth', 'जन्म', 'born']):
-                certificate_type = 'birth_certificate'
-            elif any(word in message_lower for word in ['ncl', 'non creamy', 'गैर क्रीमी', 'creamy layer']):
-                certificate_type = 'non_creamy_certificate'
+            certificate_type = next(
+                (cert_type for cert_type, pattern in _CERTIFICATE_PATTERNS.items() if pattern.search(user_message)),
+                None
+            )
             
             if certificate_type:
                 # Try web scraper first
-                try:
-                    from src.web_scraper import web_scraper
-                    updates_text = web_scraper.format_updates_for_chatbot(certificate_type)
-                    if updates_text:
-                        return f"\n\nRECENT GOVERNMENT UPDATES:\n{updates_text}\n"
-                except:
-                    pass
+                if self._web_scraper is not None:
+                    try:
+                        updates_text = self._web_scraper.format_updates_for_chatbot(certificate_type)
+                        if updates_text:
+                            return f"\n\nRECENT GOVERNMENT UPDATES:\n{updates_text}\n"
+                    except Exception:
+                        pass
                 
                 # Fallback to API updater
-                try:
-                    from src.api_updater import api_updater
-                    updates_text = api_updater.get_formatted_updates(certificate_type)
-                    if updates_text:
-                        return updates_text
-                except:
-                    pass
+                if self._api_updater is not None:
+                    try:
+                        updates_text = self._api_updater.get_formatted_updates(certificate_type)
+                        if updates_text:
+                            return updates_text
+                    except Exception:
+                        pass
             
             return ""
             
@@ -186,20 +327,13 @@ RESPOND NOW:"""
     
     def _check_knowledge_base_relevance(self, user_message: str) -> bool:
         """Check if the query is relevant to our knowledge base"""
-        message_lower = user_message.lower()
-        
-        # Certificate-related keywords
-        certificate_keywords = [
-            'certificate', 'प्रमाणपत्र', 'दाखला', 'income', 'उत्पन्न', 'caste', 'जात', 
-            'domicile', 'अधिवास', 'birth', 'जन्म', 'ncl', 'non creamy', 'गैर क्रीमी',
-            'tahsildar', 'तहसीलदार', 'revenue', 'महसूल', 'application', 'अर्ज',
-            'documents', 'कागदपत्रे', 'fee', 'शुल्क', 'office', 'कार्यालय'
-        ]
-        
+        return self._relevance_cache(user_message)
+    
+    def _match_knowledge_base(self, user_message: str) -> bool:
+        """Keyword and knowledge base search behind _check_knowledge_base_relevance"""
         # Check if query contains certificate-related keywords
-        for keyword in certificate_keywords:
-            if keyword in message_lower:
-                return True
+        if _KB_KEYWORD_RE.search(user_message):
+            return True
         
         # Check if query matches our knowledge base content
         relevant_chunks = self.search_documents(user_message)
@@ -209,20 +343,10 @@ RESPOND NOW:"""
         """Create prompt for queries outside knowledge base using Gemini's general knowledge"""
         
         # Add language-specific instructions
-        lang_instruction = ""
-        if language == 'en':
-            lang_instruction = "\n\nCRITICAL LANGUAGE INSTRUCTION: You MUST respond ONLY in ENGLISH. Do NOT use Hindi, Marathi, or Devanagari script in your response."
-        elif language == 'hi':
-            lang_instruction = "\n\nCRITICAL LANGUAGE INSTRUCTION: You MUST respond ONLY in HINDI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms."
-        elif language == 'mr':
-            lang_instruction = "\n\nCRITICAL LANGUAGE INSTRUCTION: You MUST respond ONLY in MARATHI using Devanagari script. Do NOT use English or Roman script in your response except for specific terms like office names or technical terms."
+        lang_instruction = _FALLBACK_LANG_INSTRUCTIONS.get(language, "")
         
         # Build conversation context
-        context = ""
-        if self.conversation_history:
-            context = "\n\nPREVIOUS CONVERSATION:\n"
-            for msg in self.conversation_history[-4:]:  # Last 2 exchanges
-                context += f"User: {msg['user']}\nAssistant: {msg['assistant']}\n\n"
+        context = self._history_context(4)  # Last 2 exchanges
         
         # Fallback prompt for general queries
         prompt = f"""You are GovGuideBot, an AI assistant specializing in Maharashtra government services and Indian government schemes. While your primary expertise is in Maharashtra government certificates (Income, Caste, Domicile, Birth, NCL), you can also help with other government schemes and services across India.{lang_instruction}
@@ -274,20 +398,18 @@ RESPOND NOW:"""
                 prompt = self._create_fallback_prompt(user_message, language)
             
             # Get response from Gemini
-            response = self.model.generate_content(prompt)
+            if is_relevant:
+                self._refresh_context_cache()
+                response = self.model.generate_content(prompt)
+            else:
+                response = self.fallback_model.generate_content(prompt)
             
             # Extract answer
             answer = response.text
             
             # Add disclaimer for fallback responses
             if not is_relevant:
-                disclaimer = "\n\n💡 **Note:** This information is from my general knowledge. For official procedures and latest updates, please verify on government portals or contact relevant offices directly."
-                if language == 'hi':
-                    disclaimer = "\n\n💡 **नोट:** यह जानकारी मेरे सामान्य ज्ञान से है। आधिकारिक प्रक्रियाओं और नवीनतम अपडेट के लिए, कृपया सरकारी पोर्टल पर सत्यापित करें या संबंधित कार्यालयों से सीधे संपर्क करें।"
-                elif language == 'mr':
-                    disclaimer = "\n\n💡 **टीप:** ही माहिती माझ्या सामान्य ज्ञानातून आहे. अधिकृत प्रक्रिया आणि नवीनतम अपडेटसाठी, कृपया सरकारी पोर्टलवर सत्यापित करा किंवा संबंधित कार्यालयांशी थेट संपर्क साधा."
-                
-                answer += disclaimer
+                answer += _DISCLAIMERS.get(language, _DISCLAIMERS['en'])
             
             # Update conversation history
             self.conversation_history.append({
@@ -296,10 +418,7 @@ RESPOND NOW:"""
                 'language': language,
                 'used_fallback': not is_relevant
             })
-            
-            # Keep only last 10 exchanges
-            if len(self.conversation_history) > 10:
-                self.conversation_history = self.conversation_history[-10:]
+            self._rendered_history.append(f"User: {user_message}\nAssistant: {answer}\n\n")
             
             return {
                 'success': True,
@@ -319,20 +438,37 @@ RESPOND NOW:"""
     
     def reset_conversation(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._rendered_history.clear()
         print("✓ Conversation history cleared")
     
     def get_conversation_history(self) -> List[Dict]:
         """Get conversation history"""
-        return self.conversation_history
+        return list(self.conversation_history)
     
     def search_documents(self, query: str) -> List[str]:
         """Simple keyword search in knowledge base"""
         query_lower = query.lower()
-        relevant_chunks = []
         
-        for chunk in self.text_chunks:
-            if query_lower in chunk['text'].lower():
-                relevant_chunks.append(chunk['text'][:500] + "...")
+        # Words fully enclosed by the query must appear as whole tokens in any
+        # matching chunk, so their posting lists narrow down the candidates.
+        # Words at the query edges may be partial and cannot be used.
+        candidates = None
+        for match in _WORD_RE.finditer(query_lower):
+            if match.start() == 0 or match.end() == len(query_lower):
+                continue
+            postings = self._token_index.get(match.group(), set())
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        
+        indices = range(len(self.text_chunks)) if candidates is None else sorted(candidates)
+        
+        relevant_chunks = []
+        for idx in indices:
+            if query_lower in self._chunk_texts_lower[idx]:
+                relevant_chunks.append(self.text_chunks[idx]['text'][:500] + "...")
+                if len(relevant_chunks) == 5:  # Return top 5 matches
+                    break
         
-        return relevant_chunks[:5]  # Return top 5 matches
\ No newline at end of file
+        return relevant_chunks
\ No newline at end of file
@@ -12,6 +12,12 @@ class Config:
     MODEL_NAME = "models/gemini-2.5-flash"  # Latest stable Gemini 2.5 Flash
     TEMPERATURE = 0.3
     MAX_OUTPUT_TOKENS = 8192
+    # Gemini context caching is billed and unavailable on the free tier, so it is opt-in
+    USE_CONTEXT_CACHE = os.getenv('USE_CONTEXT_CACHE', '').lower() in ('1', 'true', 'yes')
+    CONTEXT_CACHE_TTL = 3600  # Seconds to keep the knowledge base in Gemini's context cache
+    
+    # Optional speedups (off unless enabled in .env)
+    HYPERSCAN_DATES = os.getenv('HYPERSCAN_DATES', '').lower() in ('1', 'true', 'yes')  # Match notification dates with hyperscan
     
     # Rate Limits (Free tier)
     REQUESTS_PER_MINUTE = 15
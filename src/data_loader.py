@@ -1,251 +1,258 @@
 # src/data_loader.py
-import json
+import hashlib
+import logging
 import os
-from typing import List, Dict
+import pickle
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from pathlib import Path
+from src.json_utils import dumps_canonical, read_json
+from src._data_loader_fmt import (
+    fmt_basic, fmt_district, fmt_eligibility, fmt_faq, fmt_fees, fmt_issue,
+    fmt_office, fmt_offline_process, fmt_online_process, fmt_required_documents
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared immutable default for missing list fields, so lookups don't allocate a new list each time
+_EMPTY_TUPLE = ()
+# Read-only shared default for missing section dicts; mutating it raises instead of leaking state
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+# Bump when chunk layout changes so persisted chunk caches are rebuilt
+_CHUNK_CACHE_VERSION = 1
+
+def _is_data_file(name: str) -> bool:
+    """True for JSON documents, skipping hidden files and editor/partial-download leftovers"""
+    return name.endswith('.json') and not name.startswith(('.', '~'))
+
+def _intern(value):
+    """Intern repeated metadata strings (districts, categories) so chunks share one copy"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _document_key(doc: Dict) -> str:
+    """Content hash of a document, independent of key order"""
+    return hashlib.blake2b(dumps_canonical(doc), digest_size=16).hexdigest()
 
 class DocumentLoader:
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, chunk_cache_path: Optional[str] = "cache/chunks.pkl"):
         self.data_dir = Path(data_dir)
         self.documents = []
         
+        # Chunks per document content hash, so unchanged documents are not rebuilt
+        self.chunk_cache_path = chunk_cache_path
+        self._chunk_cache: Dict[str, List[Dict]] = self._load_chunk_cache()
+        self._chunk_cache_dirty = False
+        
     def load_all_documents(self) -> List[Dict]:
         """Load all JSON documents from data directory"""
-        json_files = self.data_dir.glob("*.json")
+        try:
+            with os.scandir(self.data_dir) as entries:
+                json_files = [
+                    entry.path for entry in entries
+                    if _is_data_file(entry.name) and entry.is_file(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            logger.warning(f"⚠️ Data directory not found: {self.data_dir}")
+            return self.documents
+        
+        # Files are read and parsed in parallel; results keep directory order
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(json_files)))) as executor:
+            results = list(executor.map(self._load_one, json_files))
+        
+        # One summary line instead of a write per file
+        loaded_names = []
+        failed_names = []
+        for json_file, doc_data, error in results:
+            name = os.path.basename(json_file)
+            if error is None:
+                self.documents.append(doc_data)
+                loaded_names.append(name)
+            else:
+                failed_names.append(f"{name} ({error})")
         
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    doc_data = json.load(f)
-                    self.documents.append(doc_data)
-                    print(f"✓ Loaded: {json_file.name}")
-            except Exception as e:
-                print(f"✗ Error loading {json_file.name}: {e}")
+        print(f"✓ Loaded {len(loaded_names)} JSON documents ({len(failed_names)} failed)")
+        logger.debug(f"Loaded files: {', '.join(loaded_names)}")
+        if failed_names:
+            logger.warning(f"✗ Error loading: {'; '.join(failed_names)}")
         
         return self.documents
     
+    @staticmethod
+    def _load_one(json_file: str) -> Tuple[str, Optional[Dict], Optional[Exception]]:
+        """Read and parse a single JSON document"""
+        try:
+            return json_file, read_json(json_file), None
+        except Exception as e:
+            return json_file, None, e
+    
+    def _load_chunk_cache(self) -> Dict[str, List[Dict]]:
+        """Load persisted chunks, ignoring missing or outdated cache files"""
+        if not self.chunk_cache_path or not os.path.exists(self.chunk_cache_path):
+            return {}
+        try:
+            with open(self.chunk_cache_path, 'rb') as f:
+                version, cache = pickle.load(f)
+            return cache if version == _CHUNK_CACHE_VERSION else {}
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring chunk cache: {e}")
+            return {}
+    
+    def _save_chunk_cache(self):
+        """Persist the chunk cache so restarts only rebuild changed documents"""
+        if not self.chunk_cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.chunk_cache_path) or '.', exist_ok=True)
+            tmp_path = self.chunk_cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((_CHUNK_CACHE_VERSION, self._chunk_cache), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.chunk_cache_path)
+            self._chunk_cache_dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save chunk cache: {e}")
+    
     def prepare_text_chunks(self) -> List[Dict[str, str]]:
         """Convert JSON documents to text chunks for vector store"""
-        chunks = []
+        chunks = list(self.iter_text_chunks())
         
-        for doc in self.documents:
-            doc_info = doc.get('document_info', {})
-            doc_name = doc_info.get('document_name_en', 'Unknown Document')
-            
-            # Chunk 1: Basic Information
-            basic_info = f"""
-Document: {doc_name}
-Marathi Name: {doc_info.get('document_name_marathi', 'N/A')}
-Hindi Name: {doc_info.get('document_name_hindi', 'N/A')}
-Department: {doc_info.get('issuing_department', 'N/A')}
-Issuing Authority: {doc_info.get('issuing_authority', 'N/A')}
-Validity: {doc_info.get('validity_period', 'N/A')}
-Processing Time: {doc_info.get('processing_time_normal', 'N/A')}
-Tatkal Processing: {doc_info.get('processing_time_tatkal', 'Not available')}
-Official Portal: {doc_info.get('official_portal', 'N/A')}
-Helpline: {doc_info.get('helpline_number', 'N/A')}
-Purpose: {doc_info.get('purpose', 'N/A')}
-            """
-            chunks.append({
-                'text': basic_info,
-                'metadata': {
-                    'document': doc_name,
-                    'type': 'basic_info'
-                }
-            })
-            
-            # Chunk 2: Eligibility Criteria
-            eligibility = doc.get('eligibility', {})
-            if eligibility:
-                eligibility_text = f"""
-Eligibility for {doc_name}:
-- Age Requirement: {eligibility.get('age_requirement', 'Not specified')}
-- Residence Requirement: {eligibility.get('residence_requirement', 'Not specified')}
-- Income Limit: {eligibility.get('income_limit', 'Not applicable')}
-- Other Criteria: {', '.join(eligibility.get('other_criteria', ['None']))}
-- Who Can Apply: {eligibility.get('who_can_apply', 'Any eligible citizen')}
-- Exclusions: {', '.join(eligibility.get('exclusions', ['None']))}
-                """
-                chunks.append({
-                    'text': eligibility_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'eligibility'
-                    }
-                })
-            
-            # Chunk 3: Required Documents
-            required_docs = doc.get('required_documents', [])
-            if required_docs:
-                req_docs_text = f"Required Documents for {doc_name}:\n\n"
-                for i, req_doc in enumerate(required_docs, 1):
-                    mandatory = "✓ Mandatory" if req_doc.get('is_mandatory') else "○ Optional"
-                    req_docs_text += f"{i}. {req_doc.get('doc_name_en', 'Unknown')} ({mandatory})\n"
-                    req_docs_text += f"   Marathi: {req_doc.get('doc_name_marathi', 'N/A')}\n"
-                    req_docs_text += f"   Specifications: {req_doc.get('specifications', 'N/A')}\n"
-                    req_docs_text += f"   Alternatives: {', '.join(req_doc.get('alternatives', ['None']))}\n"
-                    req_docs_text += f"   Copies Needed: {req_doc.get('number_of_copies', 1)}\n\n"
-                
-                chunks.append({
-                    'text': req_docs_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'required_documents'
-                    }
-                })
-            
-            # Chunk 4: Online Application Process
-            online_process = doc.get('application_process_online', {})
-            if online_process.get('available'):
-                online_text = f"Online Application Process for {doc_name}:\n"
-                online_text += f"Portal: {online_process.get('portal_name', 'N/A')}\n"
-                online_text += f"URL: {online_process.get('portal_url', 'N/A')}\n\n"
-                online_text += "Steps:\n"
-                
-                for step in online_process.get('steps', []):
-                    online_text += f"\nStep {step.get('step_number')}: {step.get('step_title_en')}\n"
-                    online_text += f"Description: {step.get('step_description_en')}\n"
-                    online_text += f"Tips: {step.get('tips', 'None')}\n"
-                    online_text += f"Common Errors: {step.get('common_errors', 'None')}\n"
-                
-                chunks.append({
-                    'text': online_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'online_process'
-                    }
-                })
-            
-            # Chunk 5: Offline Application Process
-            offline_process = doc.get('application_process_offline', {})
-            if offline_process.get('available'):
-                offline_text = f"Offline Application Process for {doc_name}:\n"
-                offline_text += f"Form Number: {offline_process.get('form_number', 'N/A')}\n"
-                offline_text += f"Where to Get Form: {offline_process.get('where_to_get_form', 'N/A')}\n"
-                offline_text += f"Submission Office: {offline_process.get('submission_office', 'N/A')}\n\n"
-                offline_text += "Steps:\n"
-                
-                for step in offline_process.get('steps', []):
-                    offline_text += f"\nStep {step.get('step_number')}: {step.get('step_title_en')}\n"
-                    offline_text += f"Description: {step.get('step_description_en')}\n"
-                
-                chunks.append({
-                    'text': offline_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'offline_process'
-                    }
-                })
-            
-            # Chunk 6: Fees Structure
-            fees = doc.get('fees_structure', [])
-            if fees:
-                fees_text = f"Fees for {doc_name}:\n\n"
-                for fee in fees:
-                    fees_text += f"Category: {fee.get('category', 'N/A')}\n"
-                    fees_text += f"Amount: ₹{fee.get('fee_amount', 0)}\n"
-                    fees_text += f"Payment Modes: {', '.join(fee.get('payment_modes', []))}\n"
-                    fees_text += f"Exemptions: {fee.get('exemptions', 'None')}\n\n"
-                
-                chunks.append({
-                    'text': fees_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'fees'
-                    }
-                })
+        print(f"✓ Created {len(chunks)} text chunks from documents")
+        return chunks
+    
+    def iter_text_chunks(self, release_documents: bool = False) -> Iterator[Dict]:
+        """Yield text chunks one at a time.
+        
+        With release_documents=True each document is dropped from self.documents
+        once its chunks have been yielded, so a single-pass consumer never holds
+        the whole corpus twice.
+        """
+        current: Dict[str, List[Dict]] = {}
+        for doc_index, doc in enumerate(self.documents):
+            if doc is None:
+                continue
             
-            # Chunk 7: District Variations
-            districts = doc.get('district_variations', [])
-            for district in districts:
-                district_text = f"""
-District-Specific Information for {doc_name} in {district.get('district_name')}:
-Variations: {district.get('variations', 'Same as general procedure')}
-Special Requirements: {', '.join(district.get('special_requirements', ['None']))}
-Different Fees: {district.get('different_fees', 'Same as general fees')}
-Different Offices: {district.get('different_offices', 'Standard offices')}
-Notes: {district.get('notes', 'N/A')}
-                """
-                chunks.append({
-                    'text': district_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'district_variation',
-                        'district': district.get('district_name')
-                    }
-                })
+            key = _document_key(doc)
+            chunks = self._chunk_cache.get(key)
+            if chunks is None:
+                chunks = self._document_chunks(doc)
+                self._chunk_cache_dirty = True
+            current[key] = chunks
             
-            # Chunk 8: Offices
-            offices = doc.get('offices', [])
-            for office in offices:
-                office_text = f"""
-Office for {doc_name}:
-District: {office.get('district', 'N/A')}
-Taluka: {office.get('taluka', 'N/A')}
-Office Type: {office.get('office_type', 'N/A')}
-Name: {office.get('office_name', 'N/A')}
-Address: {office.get('address', 'N/A')}
-Pincode: {office.get('pincode', 'N/A')}
-Contact: {office.get('contact_number', 'N/A')}
-Email: {office.get('email', 'N/A')}
-Working Hours: {office.get('working_hours', 'N/A')}
-Weekly Off: {office.get('weekly_off', 'N/A')}
-Best Time to Visit: {office.get('best_time_to_visit', 'N/A')}
-                """
-                chunks.append({
-                    'text': office_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'office',
-                        'district': office.get('district'),
-                        'taluka': office.get('taluka')
-                    }
-                })
+            yield from chunks
             
-            # Chunk 9: FAQs
-            faqs = doc.get('faqs', [])
-            for faq in faqs:
-                faq_text = f"""
-FAQ for {doc_name}:
-Q: {faq.get('question_en', 'N/A')}
-Q (Marathi): {faq.get('question_marathi', 'N/A')}
-
-A: {faq.get('answer_en', 'N/A')}
-A (Marathi): {faq.get('answer_marathi', 'N/A')}
-
-Category: {faq.get('category', 'General')}
-                """
-                chunks.append({
-                    'text': faq_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'faq',
-                        'category': faq.get('category')
-                    }
-                })
-            
-            # Chunk 10: Common Issues
-            issues = doc.get('common_issues', [])
-            for issue in issues:
-                issue_text = f"""
-Common Issue with {doc_name}:
-Problem: {issue.get('issue_description_en', 'N/A')}
-Problem (Marathi): {issue.get('issue_description_marathi', 'N/A')}
-
-Solution: {issue.get('solution_en', 'N/A')}
-Solution (Marathi): {issue.get('solution_marathi', 'N/A')}
-
-Frequency: {issue.get('frequency', 'Unknown')}
-Prevention: {issue.get('prevention_tips', 'N/A')}
-                """
-                chunks.append({
-                    'text': issue_text,
-                    'metadata': {
-                        'document': doc_name,
-                        'type': 'common_issue',
-                        'frequency': issue.get('frequency')
-                    }
-                })
-        
-        print(f"\n✓ Created {len(chunks)} text chunks from documents")
-        return chunks
\ No newline at end of file
+            if release_documents:
+                self.documents[doc_index] = None
+        
+        # Keep only documents from this pass so removed or edited ones don't linger
+        if current.keys() != self._chunk_cache.keys():
+            self._chunk_cache_dirty = True
+        self._chunk_cache = current
+        if self._chunk_cache_dirty:
+            self._save_chunk_cache()
+    
+    @staticmethod
+    def _document_chunks(doc: Dict) -> List[Dict]:
+        """Build the text chunks for one document"""
+        doc_info = doc.get('document_info', _EMPTY)
+        doc_name = _intern(doc_info.get('document_name_en', 'Unknown Document'))
+        
+        def meta(chunk_type: str, **extra) -> Dict:
+            metadata = {'document': doc_name, 'type': chunk_type}
+            if extra:
+                metadata.update(extra)
+            return metadata
+        
+        eligibility = doc.get('eligibility', _EMPTY)
+        required_docs = doc.get('required_documents', _EMPTY_TUPLE)
+        online_process = doc.get('application_process_online', _EMPTY)
+        offline_process = doc.get('application_process_offline', _EMPTY)
+        fees = doc.get('fees_structure', _EMPTY_TUPLE)
+        districts = doc.get('district_variations', _EMPTY_TUPLE)
+        offices = doc.get('offices', _EMPTY_TUPLE)
+        faqs = doc.get('faqs', _EMPTY_TUPLE)
+        issues = doc.get('common_issues', _EMPTY_TUPLE)
+        
+        # The chunk count is known up front, so fill a presized list instead of growing one
+        chunks: List[Optional[Dict]] = [None] * (
+            1 + bool(eligibility) + bool(required_docs)
+            + bool(online_process.get('available')) + bool(offline_process.get('available'))
+            + bool(fees) + len(districts) + len(offices) + len(faqs) + len(issues)
+        )
+        idx = 0
+        
+        # Chunk 1: Basic Information
+        chunks[idx] = {
+            'text': fmt_basic(doc_name, doc_info),
+            'metadata': meta('basic_info')
+        }
+        idx += 1
+        
+        # Chunk 2: Eligibility Criteria
+        if eligibility:
+            chunks[idx] = {'text': fmt_eligibility(doc_name, eligibility), 'metadata': meta('eligibility')}
+            idx += 1
+        
+        # Chunk 3: Required Documents
+        if required_docs:
+            chunks[idx] = {
+                'text': fmt_required_documents(doc_name, required_docs),
+                'metadata': meta('required_documents')
+            }
+            idx += 1
+        
+        # Chunk 4: Online Application Process
+        if online_process.get('available'):
+            chunks[idx] = {
+                'text': fmt_online_process(doc_name, online_process),
+                'metadata': meta('online_process')
+            }
+            idx += 1
+        
+        # Chunk 5: Offline Application Process
+        if offline_process.get('available'):
+            chunks[idx] = {
+                'text': fmt_offline_process(doc_name, offline_process),
+                'metadata': meta('offline_process')
+            }
+            idx += 1
+        
+        # Chunk 6: Fees Structure
+        if fees:
+            chunks[idx] = {'text': fmt_fees(doc_name, fees), 'metadata': meta('fees')}
+            idx += 1
+        
+        # Chunk 7: District Variations
+        for district in districts:
+            chunks[idx] = {
+                'text': fmt_district(doc_name, district),
+                'metadata': meta('district_variation', district=_intern(district.get('district_name')))
+            }
+            idx += 1
+        
+        # Chunk 8: Offices
+        for office in offices:
+            chunks[idx] = {
+                'text': fmt_office(doc_name, office),
+                'metadata': meta('office', district=_intern(office.get('district')), taluka=_intern(office.get('taluka')))
+            }
+            idx += 1
+        
+        # Chunk 9: FAQs
+        for faq in faqs:
+            chunks[idx] = {
+                'text': fmt_faq(doc_name, faq),
+                'metadata': meta('faq', category=_intern(faq.get('category')))
+            }
+            idx += 1
+        
+        # Chunk 10: Common Issues
+        for issue in issues:
+            chunks[idx] = {
+                'text': fmt_issue(doc_name, issue),
+                'metadata': meta('common_issue', frequency=_intern(issue.get('frequency')))
+            }
+            idx += 1
+        
+        return chunks
@@ -0,0 +1,56 @@
+# src/json_utils.py
+"""
+JSON helpers for cache and data files.
+Uses orjson when it is installed and falls back to the standard json module.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Files at least this large are parsed straight from a memory map instead of a heap copy
+_MMAP_THRESHOLD = 1 << 20
+
+
+def loads(data) -> Any:
+    """Parse JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON, keeping non-ASCII text readable"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    """Serialize to compact JSON with sorted keys, for hashing"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def read_json(path) -> Any:
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        return loads(f.read())
+
+
+def write_json(path, obj: Any) -> None:
+    """Write obj to a JSON file in the indented cache format"""
+    Path(path).write_bytes(dumps_pretty(obj))
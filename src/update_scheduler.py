@@ -4,13 +4,17 @@ Update Scheduler for GovGuideBot
 Automatically checks for government updates and refreshes knowledge base
 """
 
-import schedule
-import time
+import hashlib
+import heapq
+import itertools
 import threading
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
 from src.web_scraper import web_scraper
 from src.data_loader import DocumentLoader
+from src.json_utils import dumps_pretty, read_json, write_json
 import json
 import os
 
@@ -18,12 +22,38 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _seconds_until(hour: int, minute: int, weekday: Optional[int] = None) -> float:
+    """Seconds until the next local wall-clock time (optionally on a given weekday, Monday=0)"""
+    now = datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if weekday is not None:
+        target += timedelta(days=(weekday - now.weekday()) % 7)
+    if target <= now:
+        target += timedelta(days=7 if weekday is not None else 1)
+    return (target - now).total_seconds()
+
 class UpdateScheduler:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         self.is_running = False
         self.scheduler_thread = None
-        self.last_update_check = None
+        # Monotonic time of the last check; the ISO wall-clock string is only built when a summary is saved
+        self.last_update_check_mono: Optional[int] = None
+        self.last_update_check_wall: Optional[str] = None
+        
+        # Set to stop the current scheduler thread; replaced on each start
+        self._wake = threading.Event()
+        
+        # Pending jobs of the current run as (monotonic due time, job id, callable, delay until the following run)
+        self._heap: List[Tuple[float, int, Callable, Callable[[], float]]] = []
+        self._job_ids = itertools.count()
+        
+        # Hash of the last summary written, excluding its timestamp
+        self._last_summary_hash = None
+        
+        # Parsed latest_updates.json, reused until the file's mtime changes
+        self._status_cache = None
+        self._status_mtime = None
         
         # Create cache directory
         os.makedirs("cache", exist_ok=True)
@@ -48,15 +78,28 @@ class UpdateScheduler:
             else:
                 logger.info("✅ No new updates found")
             
-            self.last_update_check = datetime.now()
+            self.last_update_check_mono = time.monotonic_ns()
             
         except Exception as e:
             logger.error(f"❌ Error during update check: {e}")
     
+    @property
+    def last_update_check(self) -> Optional[datetime]:
+        """Wall-clock time of the last check, derived from the monotonic timestamp"""
+        if self.last_update_check_mono is None:
+            return None
+        return datetime.now() - timedelta(microseconds=self.seconds_since_last_check() * 1e6)
+    
+    def seconds_since_last_check(self) -> Optional[float]:
+        """Seconds elapsed since the last check, unaffected by wall-clock changes"""
+        if self.last_update_check_mono is None:
+            return None
+        return (time.monotonic_ns() - self.last_update_check_mono) / 1e9
+    
     def save_update_summary(self, updates: dict):
-        """Save summary of latest updates"""
+        """Save summary of latest updates (the file write is skipped when the content is unchanged)"""
         summary = {
-            'last_checked': datetime.now().isoformat(),
+            'last_checked': None,
             'updates_found': len(updates),
             'certificates_updated': list(updates.keys()),
             'summary': {}
@@ -68,8 +111,15 @@ class UpdateScheduler:
                 'latest_update': cert_updates[0]['text'][:100] if cert_updates else None
             }
         
-        with open('cache/latest_updates.json', 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        # The check time is always recorded; only the file write is skipped for unchanged content
+        self.last_update_check_wall = datetime.now().isoformat()
+        content_hash = hashlib.blake2b(dumps_pretty(summary), digest_size=16).digest()
+        if content_hash == self._last_summary_hash:
+            return
+        
+        summary['last_checked'] = self.last_update_check_wall
+        write_json('cache/latest_updates.json', summary)
+        self._last_summary_hash = content_hash
     
     def refresh_knowledge_base(self):
         """Refresh the knowledge base with updated information"""
@@ -90,10 +140,16 @@ class UpdateScheduler:
     def get_update_status(self) -> dict:
         """Get current update status"""
         try:
-            if os.path.exists('cache/latest_updates.json'):
-                with open('cache/latest_updates.json', 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except:
+            mtime = os.stat('cache/latest_updates.json').st_mtime_ns
+            if mtime != self._status_mtime:
+                self._status_cache = read_json('cache/latest_updates.json')
+                self._status_mtime = mtime
+            
+            # An unchanged summary is not rewritten, so the file's timestamp can lag the last check
+            if self.last_update_check_wall and self._status_cache.get('last_checked') != self.last_update_check_wall:
+                return dict(self._status_cache, last_checked=self.last_update_check_wall)
+            return self._status_cache
+        except Exception:
             pass
         
         return {
@@ -103,16 +159,35 @@ class UpdateScheduler:
             'summary': {}
         }
     
+    def _add_job(self, func: Callable, next_delay: Callable[[], float]):
+        """Queue func to run after next_delay() seconds, rescheduling it the same way after each run"""
+        heapq.heappush(self._heap, (time.monotonic() + next_delay(), next(self._job_ids), func, next_delay))
+    
+    @staticmethod
+    def _run_due_jobs(heap: list):
+        """Run every job in heap whose due time has passed and queue its next run"""
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            _, job_id, func, next_delay = heapq.heappop(heap)
+            func()
+            heapq.heappush(heap, (time.monotonic() + next_delay(), job_id, func, next_delay))
+    
     def start_scheduler(self):
         """Start the update scheduler"""
         if self.is_running:
             logger.warning("⚠️ Scheduler is already running")
             return
         
+        # Each run gets its own heap and wake event, so a thread still finishing a job
+        # after stop_scheduler cannot touch the jobs of a later start
+        self._heap = []
+        self._wake = threading.Event()
+        heap, wake = self._heap, self._wake
+        
         # Schedule updates
-        schedule.every(6).hours.do(self.check_for_updates)  # Every 6 hours
-        schedule.every().day.at("09:00").do(self.check_for_updates)  # Daily at 9 AM
-        schedule.every().monday.at("08:00").do(self.check_for_updates)  # Weekly on Monday
+        self._add_job(self.check_for_updates, lambda: 6 * 3600)  # Every 6 hours
+        self._add_job(self.check_for_updates, lambda: _seconds_until(9, 0))  # Daily at 9 AM
+        self._add_job(self.check_for_updates, lambda: _seconds_until(8, 0, weekday=0))  # Weekly on Monday
         
         self.is_running = True
         
@@ -123,9 +198,15 @@ class UpdateScheduler:
             # Run initial check
             self.check_for_updates()
             
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+            while not wake.is_set():
+                self._run_due_jobs(heap)
+                
+                # Sleep until the next job is due instead of polling every minute
+                idle = heap[0][0] - time.monotonic() if heap else 3600
+                wake.wait(timeout=max(0, idle))
+            
+            # Only this thread ever touches its heap, so it is cleared here rather than in stop_scheduler
+            heap.clear()
         
         self.scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
         self.scheduler_thread.start()
@@ -133,7 +214,7 @@ class UpdateScheduler:
     def stop_scheduler(self):
         """Stop the update scheduler"""
         self.is_running = False
-        schedule.clear()
+        self._wake.set()
         logger.info("🛑 Update scheduler stopped")
     
     def force_update_check(self):
@@ -4,50 +4,226 @@ Web Scraper for Government Updates
 Monitors Maharashtra government websites for GRs, notifications, and updates
 """
 
+import asyncio
 import requests
-from bs4 import BeautifulSoup
-import json
+from requests.adapters import HTTPAdapter
+import certifi
+import urllib3
+from urllib3.util.retry import Retry
 import os
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
 import time
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 import hashlib
 import re
+import shelve
+import threading
+from src.config import Config
+from src.json_utils import read_json, write_json
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    from bs4 import BeautifulSoup
+    import soupsieve
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Dates such as 01/04/2025 or 12-05-25 in notification text
+_DATE_RE = re.compile(r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})')
+
+# The same pattern as a hyperscan database; UTF8 + UCP keep \d matching Unicode digits as re does.
+# Opt-in: on short notification texts re.search (~2 µs) is already cheaper than a scan with a
+# Python callback per match, so hyperscan is only used when Config.HYPERSCAN_DATES is set
+_DATE_DB = None
+if HYPERSCAN_AVAILABLE and Config.HYPERSCAN_DATES:
+    _DATE_DB = hyperscan.Database()
+    _DATE_DB.compile(
+        expressions=[_DATE_RE.pattern.encode()],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP]
+    )
+
+# Stored with each cached page parse; bump when parsing changes so unchanged pages are re-parsed
+_PAGE_CACHE_VERSION = 1
+
+# Updates kept per certificate type; the oldest are evicted first
+_MAX_UPDATES = 50
+
+# Transient server errors worth retrying, in both the sync adapter and the async fetch
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+# Responses declaring a larger body are skipped before it is downloaded
+_MAX_PAGE_BYTES = 2_000_000
+
+
+def _find_date(text: str) -> Optional[str]:
+    """First date in the text, as _DATE_RE.search would find it"""
+    if _DATE_DB is None:
+        date_match = _DATE_RE.search(text)
+        return date_match.group(1) if date_match else None
+    
+    # hyperscan reports every (start, end) byte span; re picks the leftmost start, then the longest
+    data = text.encode('utf-8')
+    spans = []
+    _DATE_DB.scan(data, match_event_handler=lambda _id, start, end, _flags, _context: spans.append((start, -end)))
+    if not spans:
+        return None
+    
+    start, end = min(spans)
+    return data[start:-end].decode('utf-8')
+
+
+def _parse_page(html_content: str, base_url: str, keyword_pattern: Optional[re.Pattern] = None) -> List[Dict]:
+    """Extract notifications from a page"""
+    if SELECTOLAX_AVAILABLE:
+        tree = LexborHTMLParser(html_content)
+    else:
+        tree = BeautifulSoup(html_content, 'html.parser')
+    notifications = []
+    
+    if SELECTOLAX_AVAILABLE:
+        elements = tree.css(GovWebScraper._notification_selector)
+    else:
+        elements = GovWebScraper._compiled_selector.select(tree)
+    for element in elements:
+        notification = _parse_notification_element(element, base_url, keyword_pattern)
+        if notification:
+            notifications.append(notification)
+    
+    return notifications
+
+
+def _parse_notification_element(element, base_url: str, keyword_pattern: Optional[re.Pattern] = None) -> Optional[Dict]:
+    """Parse individual notification element, skipping it early if it contains none of the keywords"""
+    try:
+        # Extract text content
+        if SELECTOLAX_AVAILABLE:
+            text = element.text(strip=True)
+        else:
+            text = element.get_text(strip=True)
+        if len(text) < 10:  # Skip very short texts
+            return None
+        
+        # Links and date are only worth extracting for text some certificate type would match
+        if keyword_pattern is not None and not keyword_pattern.search(text.lower()):
+            return None
+        
+        # Extract links
+        if SELECTOLAX_AVAILABLE:
+            anchors = [
+                (link.attributes.get('href') or '', link.text(strip=True))
+                for link in element.css('a[href]')
+            ]
+        else:
+            anchors = [
+                (link['href'], link.get_text(strip=True))
+                for link in element.find_all('a', href=True)
+            ]
+        
+        links = []
+        for href, link_text in anchors:
+            if href.startswith('/'):
+                href = base_url + href
+            links.append({
+                'text': link_text,
+                'url': href
+            })
+        
+        # Extract date if available
+        date_str = _find_date(text)
+        
+        return {
+            'text': text,
+            'links': links,
+            'date': date_str,
+            'source_url': base_url,
+            'extracted_at': datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error parsing notification element: {e}")
+        return None
+
+
 class GovWebScraper:
+    # Common paths for notifications on each site
+    PATHS = (
+        '/',
+        '/notifications',
+        '/news',
+        '/updates',
+        '/circulars',
+        '/gr',
+        '/en/notifications',
+        '/en/news'
+    )
+    
+    # Common selectors for notifications
+    NOTIFICATION_SELECTORS = (
+        '.notification', '.news', '.update', '.circular',
+        '.gr-list', '.announcement', '.latest-news',
+        '[class*="notification"]', '[class*="news"]',
+        '[class*="update"]', '[class*="circular"]'
+    )
+    
+    # Joined so one traversal covers every selector and an element matching several is returned once;
+    # the soupsieve matcher is built once for the BeautifulSoup path (selectolax takes the string)
+    _notification_selector = ', '.join(NOTIFICATION_SELECTORS)
+    _compiled_selector = None if SELECTOLAX_AVAILABLE else soupsieve.compile(_notification_selector)
+    
     def __init__(self):
-        # Fix SSL certificate issues
-        import ssl
-        import certifi
-        import urllib3
-        
-        # Set SSL certificate path
+        # Process-wide CA bundle. requests also reads CURL_CA_BUNDLE (trust_env) and lets it
+        # override session.verify, so fetch_page passes verify=False on each request
         os.environ['SSL_CERT_FILE'] = certifi.where()
         os.environ['CURL_CA_BUNDLE'] = certifi.where()
         
-        # Create session with proper SSL handling
+        # One session for every request; retries live on the adapter instead of in fetch_page
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
-        # Disable SSL verification for government sites (they often have certificate issues)
+        # Keep connections to each host alive across paths; transient server errors are retried with backoff
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=1, status_forcelist=_RETRY_STATUSES)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Disable SSL verification for government sites (they often have certificate issues);
+        # kept for callers using the session directly, fetch_page also passes it per request
         self.session.verify = False
         
         # Suppress SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
-        # Alternative: Use system certificates
-        try:
-            self.session.verify = certifi.where()
-        except:
-            self.session.verify = False
-        
         # Government websites to monitor
         self.gov_websites = {
             'aaple_sarkar': 'https://aaplesarkar.mahaonline.gov.in',
@@ -57,6 +233,16 @@ class GovWebScraper:
             'crsorgi': 'https://crsorgi.gov.in'
         }
         
+        # (site, base URL, page URL) for every path on every site
+        self._urls = [
+            (site_name, base_url, base_url + path)
+            for site_name, base_url in self.gov_websites.items()
+            for path in self.PATHS
+        ]
+        
+        # Monotonic time each host may next be requested (async path)
+        self._last_hit: Dict[str, float] = {}
+        
         # Keywords to monitor for each certificate type
         self.certificate_keywords = {
             'income_certificate': [
@@ -81,210 +267,389 @@ class GovWebScraper:
             ]
         }
         
+        # One alternation per certificate type, so check_relevance is a single C-level search
+        self._cert_regex = {
+            cert_type: re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords))
+            for cert_type, keywords in self.certificate_keywords.items()
+            if keywords
+        }
+        
+        # Any keyword of any type, used to skip irrelevant elements while parsing
+        self._any_keyword = re.compile('|'.join(
+            re.escape(keyword.lower())
+            for keywords in self.certificate_keywords.values()
+            for keyword in keywords
+        ))
+        
+        # Cached page parses are keyword-filtered, so they are only reused under the same keyword set
+        self._page_cache_tag = f"{_PAGE_CACHE_VERSION}:{self.get_content_hash(self._any_keyword.pattern)}"
+        
+        # One automaton over all keywords, so a text is scanned once for every certificate type
+        self._keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            keyword_types = defaultdict(list)
+            for cert_type, keywords in self.certificate_keywords.items():
+                for keyword in keywords:
+                    keyword_types[keyword.lower()].append(cert_type)
+            
+            self._keyword_automaton = ahocorasick.Automaton()
+            for keyword, cert_types in keyword_types.items():
+                self._keyword_automaton.add_word(keyword, tuple(cert_types))
+            self._keyword_automaton.make_automaton()
+        
         # Cache directory for storing updates
         self.cache_dir = "cache/updates"
         os.makedirs(self.cache_dir, exist_ok=True)
-    
-    def fetch_page_content(self, url: str) -> Optional[str]:
-        """Fetch content from a webpage with retry logic"""
-        max_retries = 3
         
-        for attempt in range(max_retries):
-            try:
-                # Try with different SSL configurations
-                ssl_configs = [
-                    {'verify': False},  # No SSL verification
-                    {'verify': True},   # Default SSL verification
-                ]
-                
-                for config in ssl_configs:
-                    try:
-                        response = self.session.get(
-                            url, 
-                            timeout=15,
-                            **config
-                        )
-                        response.raise_for_status()
-                        logger.info(f"✓ Successfully fetched {url}")
-                        return response.text
-                    except requests.exceptions.SSLError:
-                        continue
-                    except Exception as e:
-                        if attempt == max_retries - 1:
-                            logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
-                        continue
-                
-                # If all SSL configs fail, try with requests without session
-                try:
-                    import urllib3
-                    urllib3.disable_warnings()
-                    
-                    response = requests.get(
-                        url, 
-                        timeout=15, 
-                        verify=False,
-                        headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                    )
-                    response.raise_for_status()
-                    logger.info(f"✓ Successfully fetched {url} (fallback method)")
-                    return response.text
-                except:
-                    pass
-                    
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to fetch {url} after {max_retries} attempts: {e}")
-                else:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+        # Saved updates per certificate type ({id: update}, oldest first), loaded lazily by load_updates
+        self._update_index: Dict[str, "OrderedDict[str, Dict]"] = {}
+        
+        # Number of queued updates per certificate type not yet written to disk
+        self._pending_writes: Dict[str, int] = {}
+        
+        # Per-URL validators (ETag/Last-Modified), body hash and parsed notifications.
+        # Opened for the duration of a scrape so unchanged pages are not parsed again.
+        self.page_cache_path = os.path.join("cache", "pages")
+        self._page_cache = None
         
+        # Serializes scrapes and save_update calls on this instance
+        self._scrape_lock = threading.Lock()
+    
+    def _cached_page(self, url: str) -> Optional[Dict]:
+        """Page cache entry for url, unless it was stored by another parse version or keyword set"""
+        cached = self._page_cache.get(url) if self._page_cache is not None else None
+        if cached and cached.get('tag') == self._page_cache_tag:
+            return cached
         return None
     
-    def extract_notifications(self, html_content: str, base_url: str) -> List[Dict]:
-        """Extract notifications and updates from HTML content"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        notifications = []
-        
-        # Common selectors for notifications
-        selectors = [
-            '.notification', '.news', '.update', '.circular',
-            '.gr-list', '.announcement', '.latest-news',
-            '[class*="notification"]', '[class*="news"]',
-            '[class*="update"]', '[class*="circular"]'
-        ]
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a page fetched in an earlier scrape"""
+        # Without a usable entry the page must be fetched in full, so a 304 is never requested
+        cached = self._cached_page(url)
+        if not cached:
+            return {}
         
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                notification = self.parse_notification_element(element, base_url)
-                if notification:
-                    notifications.append(notification)
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+    
+    @staticmethod
+    def _is_parseable(status: int, headers) -> bool:
+        """Whether a response is an HTML page small enough to parse, judged from its headers alone"""
+        if status == 304:
+            return True
+        if 'html' not in headers.get('Content-Type', '').lower():
+            return False
         
-        return notifications
+        try:
+            return int(headers.get('Content-Length') or 0) <= _MAX_PAGE_BYTES
+        except ValueError:
+            return True
     
-    def parse_notification_element(self, element, base_url: str) -> Optional[Dict]:
-        """Parse individual notification element"""
+    def fetch_page(self, url: str) -> Optional[Tuple[int, Dict[str, Optional[str]], str]]:
+        """Fetch a page as (status, validators, text); status 304 means the cached copy is current"""
         try:
-            # Extract text content
-            text = element.get_text(strip=True)
-            if len(text) < 10:  # Skip very short texts
-                return None
-            
-            # Extract links
-            links = []
-            for link in element.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('/'):
-                    href = base_url + href
-                links.append({
-                    'text': link.get_text(strip=True),
-                    'url': href
-                })
-            
-            # Extract date if available
-            date_match = re.search(r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})', text)
-            date_str = date_match.group(1) if date_match else None
-            
-            return {
-                'text': text,
-                'links': links,
-                'date': date_str,
-                'source_url': base_url,
-                'extracted_at': datetime.now().isoformat()
-            }
+            # Streamed so PDFs and oversized pages are dropped before their body is read
+            # verify=False per request: a CURL_CA_BUNDLE in the environment would override session.verify
+            with self.session.get(
+                url,
+                timeout=15,
+                headers=self._conditional_headers(url),
+                stream=True,
+                verify=False
+            ) as response:
+                response.raise_for_status()
+                if not self._is_parseable(response.status_code, response.headers):
+                    logger.info(f"Skipping {url}: not an HTML page or too large")
+                    return None
+                
+                logger.info(f"✓ Successfully fetched {url}")
+                validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+                return response.status_code, validators, response.text
         except Exception as e:
-            logger.error(f"Error parsing notification element: {e}")
+            logger.warning(f"Failed to fetch {url}: {e}")
             return None
     
-    def check_relevance(self, notification: Dict, certificate_type: str) -> bool:
-        """Check if notification is relevant to a certificate type"""
-        keywords = self.certificate_keywords.get(certificate_type, [])
-        text_lower = notification['text'].lower()
+    def fetch_page_content(self, url: str) -> Optional[str]:
+        """Fetch content from a webpage (retries and backoff are handled by the session adapter)"""
+        page = self.fetch_page(url)
+        if page is None or page[0] == 304:
+            return None
+        return page[2]
+    
+    def extract_notifications(self, html_content: str, base_url: str) -> List[Dict]:
+        """Extract notifications and updates from HTML content"""
+        return _parse_page(html_content, base_url, self._any_keyword)
+    
+    def parse_notification_element(self, element, base_url: str) -> Optional[Dict]:
+        """Parse individual notification element"""
+        return _parse_notification_element(element, base_url)
+    
+    def check_relevance(self, text_lower: str, certificate_type: str) -> bool:
+        """Check if already-lowercased notification text is relevant to a certificate type"""
+        pattern = self._cert_regex.get(certificate_type)
+        if pattern is None:
+            return False
         
-        # Check if any keyword matches
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                return True
+        return pattern.search(text_lower) is not None
+    
+    def matching_certificate_types(self, notification: Dict) -> List[str]:
+        """Certificate types the notification is relevant to, in certificate_keywords order"""
+        # Lowercased once and shared by every certificate type (keywords are lowercased in __init__)
+        text_lower = notification['text'].lower()
+        if self._keyword_automaton is None:
+            return [
+                cert_type for cert_type in self.certificate_keywords
+                if self.check_relevance(text_lower, cert_type)
+            ]
         
-        return False
+        matched = set()
+        for _, cert_types in self._keyword_automaton.iter(text_lower):
+            matched.update(cert_types)
+        return [cert_type for cert_type in self.certificate_keywords if cert_type in matched]
     
     def get_content_hash(self, content: str) -> str:
         """Generate hash for content to detect changes"""
-        return hashlib.md5(content.encode()).hexdigest()
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
     
-    def save_update(self, certificate_type: str, update_data: Dict):
-        """Save update to cache file"""
-        cache_file = os.path.join(self.cache_dir, f"{certificate_type}_updates.json")
+    def load_updates(self, certificate_type: str) -> "OrderedDict[str, Dict]":
+        """Saved updates for a certificate type keyed by id, read from the cache file on first use"""
+        index = self._update_index.get(certificate_type)
+        if index is None:
+            cache_file = os.path.join(self.cache_dir, f"{certificate_type}_updates.json")
+            
+            updates = []
+            if os.path.exists(cache_file):
+                try:
+                    updates = read_json(cache_file)
+                except Exception:
+                    updates = []
+            
+            # Re-key by the current content hash so entries saved with an older hash still deduplicate
+            index = OrderedDict()
+            for update in updates:
+                update['id'] = self.get_content_hash(update.get('text', ''))
+                index[update['id']] = update
+            self._update_index[certificate_type] = index
         
-        # Load existing updates
-        updates = []
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    updates = json.load(f)
-            except:
-                updates = []
+        return index
+    
+    def _queue_update(self, certificate_type: str, update_data: Dict) -> bool:
+        """Add an update to the in-memory index; it is written out by _flush_updates"""
+        updates = self.load_updates(certificate_type)
         
-        # Add new update
-        update_data['id'] = self.get_content_hash(update_data['text'])
+        # Add new update; the id is computed once even when the notification matches several types
+        if 'id' not in update_data:
+            update_data['id'] = self.get_content_hash(update_data['text'])
         
         # Check if update already exists
-        existing_ids = [u.get('id') for u in updates]
-        if update_data['id'] not in existing_ids:
-            updates.append(update_data)
-            
-            # Keep only last 50 updates
-            updates = updates[-50:]
-            
-            # Save updates
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(updates, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"New update saved for {certificate_type}")
-            return True
+        if update_data['id'] in updates:
+            return False
+        
+        # Store a copy: the caller keeps mutating the same dict for other certificate types
+        updates[update_data['id']] = dict(update_data)
+        
+        # Keep only the last _MAX_UPDATES updates, evicting in insertion order
+        while len(updates) > _MAX_UPDATES:
+            updates.popitem(last=False)
+        
+        self._pending_writes[certificate_type] = self._pending_writes.get(certificate_type, 0) + 1
+        return True
+    
+    def _flush_updates(self):
+        """Write each certificate type's cache file once for all updates queued since the last flush"""
+        for certificate_type, count in self._pending_writes.items():
+            cache_file = os.path.join(self.cache_dir, f"{certificate_type}_updates.json")
+            try:
+                write_json(cache_file, list(self._update_index[certificate_type].values()))
+                logger.info(f"{count} new update(s) saved for {certificate_type}")
+            except Exception as e:
+                logger.error(f"Error saving updates for {certificate_type}: {e}")
+        self._pending_writes.clear()
+    
+    def save_update(self, certificate_type: str, update_data: Dict):
+        """Save update to cache file"""
+        with self._scrape_lock:
+            if self._queue_update(certificate_type, update_data):
+                self._flush_updates()
+                return True
         
         return False
     
+    async def _wait_for_host(self, host: str):
+        """Space requests to the same host at least a second apart without delaying other hosts"""
+        now = time.monotonic()
+        start = max(now, self._last_hit.get(host, 0.0) + 1)
+        # Reserve the slot before sleeping so concurrent requests queue up behind it
+        self._last_hit[host] = start
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def fetch_page_async(self, session, url: str, host_limit: asyncio.Semaphore) -> Optional[Tuple[int, Dict[str, Optional[str]], str]]:
+        """Async counterpart of fetch_page that does not block requests to other hosts"""
+        max_retries = 3
+        host = urlsplit(url).netloc
+        
+        error = None
+        for attempt in range(max_retries):
+            # Back off outside the host limit so waiting retries don't hold up other paths on the host
+            if attempt:
+                await asyncio.sleep(2 ** (attempt - 1))
+            
+            async with host_limit:
+                await self._wait_for_host(host)
+                try:
+                    async with session.get(url, headers=self._conditional_headers(url)) as response:
+                        # Same transient statuses the sync adapter retries; other errors are final
+                        if response.status in _RETRY_STATUSES:
+                            error = f"HTTP {response.status}"
+                            continue
+                        response.raise_for_status()
+                        
+                        # The body is only read for HTML pages of a sensible size
+                        if not self._is_parseable(response.status, response.headers):
+                            logger.info(f"Skipping {url}: not an HTML page or too large")
+                            return None
+                        
+                        content = await response.text(errors='replace')
+                        logger.info(f"✓ Successfully fetched {url}")
+                        validators = {
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified')
+                        }
+                        return response.status, validators, content
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    error = e
+                except Exception as e:
+                    logger.warning(f"Failed to fetch {url}: {e}")
+                    return None
+        
+        logger.warning(f"Failed to fetch {url} after {max_retries} attempts: {error}")
+        return None
+    
+    def _cached_notifications(self, url: str, page: Tuple[int, Dict[str, Optional[str]], str]) -> Optional[List[Dict]]:
+        """Notifications parsed in an earlier scrape if the page has not changed, else None"""
+        status, _, content = page
+        cached = self._cached_page(url)
+        
+        if status == 304:
+            return cached['notifications'] if cached else []
+        if cached and cached['hash'] == self.get_content_hash(content):
+            return cached['notifications']
+        return None
+    
+    def _remember_page(self, url: str, page: Tuple[int, Dict[str, Optional[str]], str], notifications: List[Dict]):
+        """Store a page's validators, body hash and notifications for the next scrape"""
+        status, validators, content = page
+        if self._page_cache is None or status == 304:
+            return
+        
+        self._page_cache[url] = {
+            'tag': self._page_cache_tag,
+            'etag': validators['etag'],
+            'last_modified': validators['last_modified'],
+            'hash': self.get_content_hash(content),
+            'notifications': notifications
+        }
+    
+    def page_notifications(self, url: str, base_url: str, page: Tuple[int, Dict[str, Optional[str]], str]) -> List[Dict]:
+        """Notifications on a fetched page, reusing the cached parse when the page has not changed"""
+        notifications = self._cached_notifications(url, page)
+        if notifications is None:
+            notifications = self.extract_notifications(page[2], base_url)
+        
+        self._remember_page(url, page, notifications)
+        return notifications
+    
+    def categorize_notifications(self, notifications: List[Dict], site_name: str, all_updates: Dict[str, List[Dict]]):
+        """Save the new notifications relevant to each certificate type"""
+        for notification in notifications:
+            for cert_type in self.matching_certificate_types(notification):
+                notification['site'] = site_name
+                notification['certificate_type'] = cert_type
+                
+                # Queue if new; files are written once at the end of the scrape
+                if self._queue_update(cert_type, notification):
+                    if cert_type not in all_updates:
+                        all_updates[cert_type] = []
+                    all_updates[cert_type].append(notification)
+    
+    def process_page(self, page, url: str, site_name: str, base_url: str, all_updates: Dict[str, List[Dict]]):
+        """Extract notifications from a page and save the relevant new ones"""
+        notifications = self.page_notifications(url, base_url, page)
+        self.categorize_notifications(notifications, site_name, all_updates)
+    
+    async def scrape_government_updates_async(self) -> Dict[str, List[Dict]]:
+        """Fetch all pages concurrently, then parse them in the original site/path order"""
+        targets = self._urls
+        
+        # At most two requests in flight per host; other hosts are not held up.
+        # Semaphores bind to the running loop, so they are created per run.
+        host_limits = defaultdict(lambda: asyncio.Semaphore(2))
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=2, ssl=False)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            timeout=aiohttp.ClientTimeout(total=15)
+        ) as session:
+            logger.info(f"Scraping {len(self.gov_websites)} sites ({len(targets)} pages)")
+            pages = await asyncio.gather(*(
+                self.fetch_page_async(session, url, host_limits[urlsplit(url).netloc])
+                for _, _, url in targets
+            ))
+        
+        # Parsing stays in this process: a worker pool costs more to start than the pages take to parse
+        all_updates = {}
+        for (site_name, base_url, url), page in zip(targets, pages):
+            if page:
+                self.process_page(page, url, site_name, base_url, all_updates)
+        
+        return all_updates
+    
     def scrape_government_updates(self) -> Dict[str, List[Dict]]:
         """Main method to scrape all government websites for updates"""
+        # The page cache handle, update index and pending writes live on the shared instance,
+        # so a forced update waits for a scheduled scrape (or vice versa) instead of interleaving
+        with self._scrape_lock:
+            try:
+                self._page_cache = shelve.open(self.page_cache_path)
+            except Exception as e:
+                logger.warning(f"Page cache unavailable, parsing every page: {e}")
+                self._page_cache = {}
+            
+            try:
+                if AIOHTTP_AVAILABLE:
+                    return asyncio.run(self.scrape_government_updates_async())
+                return self._scrape_government_updates_sequential()
+            finally:
+                self._flush_updates()
+                if hasattr(self._page_cache, 'close'):
+                    self._page_cache.close()
+                self._page_cache = None
+    
+    def _scrape_government_updates_sequential(self) -> Dict[str, List[Dict]]:
+        """Fetch pages one at a time (used when aiohttp is not installed)"""
         all_updates = {}
         
-        for site_name, base_url in self.gov_websites.items():
-            logger.info(f"Scraping {site_name}: {base_url}")
+        current_site = None
+        for site_name, base_url, url in self._urls:
+            if site_name != current_site:
+                logger.info(f"Scraping {site_name}: {base_url}")
+                current_site = site_name
             
-            # Try different common paths for notifications
-            paths_to_check = [
-                '/',
-                '/notifications',
-                '/news',
-                '/updates',
-                '/circulars',
-                '/gr',
-                '/en/notifications',
-                '/en/news'
-            ]
+            page = self.fetch_page(url)
             
-            for path in paths_to_check:
-                url = base_url + path
-                content = self.fetch_page_content(url)
-                
-                if content:
-                    notifications = self.extract_notifications(content, base_url)
-                    
-                    # Categorize notifications by certificate type
-                    for notification in notifications:
-                        for cert_type in self.certificate_keywords.keys():
-                            if self.check_relevance(notification, cert_type):
-                                notification['site'] = site_name
-                                notification['certificate_type'] = cert_type
-                                
-                                # Save if new
-                                if self.save_update(cert_type, notification):
-                                    if cert_type not in all_updates:
-                                        all_updates[cert_type] = []
-                                    all_updates[cert_type].append(notification)
-                
-                # Be respectful to servers
-                time.sleep(1)
+            if page:
+                self.process_page(page, url, site_name, base_url, all_updates)
+            
+            # Be respectful to servers
+            time.sleep(1)
         
         return all_updates
     
@@ -296,8 +661,7 @@ class GovWebScraper:
             return []
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                updates = json.load(f)
+            updates = read_json(cache_file)
             
             # Filter by date
             cutoff_date = datetime.now() - timedelta(days=days)